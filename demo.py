@@ -7,16 +7,23 @@ UPDATED: Fixed for modern Amp API compatibility
 """
 
 import requests
-import json
 import pandas as pd
 from datetime import datetime
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Shared session so the probe queries reuse one keep-alive connection
+_SESSION = requests.Session()
+
 def test_amp_connection(amp_url="http://localhost:1603"):
     """Test if Amp server is running and responsive"""
     try:
         # Simple test query
         test_query = "SELECT 1 as test"
-        response = requests.post(amp_url, data=test_query, timeout=10)
+        response = _SESSION.post(amp_url, data=test_query, timeout=10)
         response.raise_for_status()
         print("✅ Amp server is running and responsive!")
         return True
@@ -46,12 +53,11 @@ def get_sample_data(amp_url="http://localhost:1603"):
         LIMIT 10
         """
         
-        response = requests.post(amp_url, data=query, timeout=30)
+        response = _SESSION.post(amp_url, data=query, timeout=30)
         response.raise_for_status()
         
-        # Parse JSONL response
-        lines = response.text.strip().split('\n')
-        data = [json.loads(line) for line in lines if line.strip()]
+        # Parse JSONL response - bounded result, so split the raw bytes once
+        data = [_json.loads(line) for line in response.content.split(b'\n') if line]
         
         if not data:
             print("⚠️  No transaction data found. Amp may still be syncing.")
@@ -86,11 +92,10 @@ def check_whale_data(amp_url="http://localhost:1603"):
         AND "to" IS NOT NULL
         """
         
-        response = requests.post(amp_url, data=query, timeout=30)
+        response = _SESSION.post(amp_url, data=query, timeout=30)
         response.raise_for_status()
         
-        lines = response.text.strip().split('\n')
-        data = [json.loads(line) for line in lines if line.strip()]
+        data = [_json.loads(line) for line in response.content.split(b'\n') if line]
         
         if data and data[0]['whale_count'] > 0:
             stats = data[0]
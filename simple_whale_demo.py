@@ -4,12 +4,11 @@ Works without Amp server - shows the concept with sample data
 """
 
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import random
-import time
 
 # Configure Streamlit page
 st.set_page_config(
@@ -18,67 +17,79 @@ st.set_page_config(
     layout="wide"
 )
 
-def generate_sample_whale_data(num_transfers=50):
-    """Generate realistic sample whale transfer data"""
-    
-    # Sample whale addresses (real ones for realism)
-    whale_addresses = [
-        "0x47ac0Fb4F2D84898e4D9E7b4DaB3C24507a6D503",  # Binance
-        "0x8894E0a0c962CB723c1976a4421c95949bE2D4E3",  # Binance 2
-        "0x28C6c06298d514Db089934071355E5743bf21d60",  # Binance 3
-        "0x21a31Ee1afC51d94C2eFcCAa2092aD1028285549",  # Binance 4
-        "0xDFd5293D8e347dFe59E90eFd55b2956a1343963d",  # Binance 5
-        "0x56Eddb7aa87536c09CCc2793473599fD21A8b17F",  # Binance 6
-        "0x9696f59E4d72E237BE84fFD425DCaD154Bf96976",  # Coinbase
-        "0x503828976D22510aad0201ac7EC88293211D23Da",  # Coinbase 2
-        "0xA9D1e08C7793af67e9d92fe308d5697FB81d3E43",  # Coinbase 3
-        "0x6262998Ced04146fA42253a5C0AF90CA02dfd2A3",  # Coinbase 4
-    ]
-    
-    # Generate sample data
-    data = []
-    base_time = datetime.now() - timedelta(hours=2)
-    
-    for i in range(num_transfers):
-        # Random time in last 2 hours
-        minutes_ago = random.randint(0, 120)
-        timestamp = base_time + timedelta(minutes=minutes_ago)
-        
-        # Random whale transfer amount (50-5000 ETH)
-        eth_amount = random.uniform(50, 5000)
-        
-        # Random addresses
-        from_addr = random.choice(whale_addresses)
-        to_addr = random.choice([addr for addr in whale_addresses if addr != from_addr])
-        
-        # Random transaction hash
-        tx_hash = f"0x{''.join(random.choices('0123456789abcdef', k=64))}"
-        
-        # Random gas data
-        gas_gwei = random.uniform(10, 100)
-        gas_used = random.randint(21000, 500000)
-        gas_fee_eth = (gas_gwei * gas_used) / 1e9
-        
-        # Random block number
-        block_number = 21000000 + random.randint(0, 100000)
-        
-        data.append({
-            'block_timestamp': timestamp,
-            'block_number': block_number,
-            'transaction_hash': tx_hash,
-            'from_address': from_addr,
-            'to_address': to_addr,
-            'eth_amount': eth_amount,
-            'gas_gwei': gas_gwei,
-            'gas_used': gas_used,
-            'gas_fee_eth': gas_fee_eth
-        })
-    
-    return pd.DataFrame(data).sort_values('block_timestamp', ascending=False)
+# Sample whale addresses (real ones for realism)
+WHALE_ADDRESSES = np.array([
+    "0x47ac0Fb4F2D84898e4D9E7b4DaB3C24507a6D503",  # Binance
+    "0x8894E0a0c962CB723c1976a4421c95949bE2D4E3",  # Binance 2
+    "0x28C6c06298d514Db089934071355E5743bf21d60",  # Binance 3
+    "0x21a31Ee1afC51d94C2eFcCAa2092aD1028285549",  # Binance 4
+    "0xDFd5293D8e347dFe59E90eFd55b2956a1343963d",  # Binance 5
+    "0x56Eddb7aa87536c09CCc2793473599fD21A8b17F",  # Binance 6
+    "0x9696f59E4d72E237BE84fFD425DCaD154Bf96976",  # Coinbase
+    "0x503828976D22510aad0201ac7EC88293211D23Da",  # Coinbase 2
+    "0xA9D1e08C7793af67e9d92fe308d5697FB81d3E43",  # Coinbase 3
+    "0x6262998Ced04146fA42253a5C0AF90CA02dfd2A3",  # Coinbase 4
+])
+
+@st.cache_data(ttl=10)
+def generate_sample_whale_data(num_transfers: int = 50, min_eth: float = 50.0) -> pd.DataFrame:
+    """Generate realistic sample whale transfer data at or above min_eth"""
+    
+    # Generate all sample columns in one batch
+    rng = np.random.default_rng()
+    n = len(WHALE_ADDRESSES)
+    base_time = pd.Timestamp(datetime.now() - timedelta(hours=2))
+    
+    # Random time in last 2 hours
+    minutes_ago = rng.integers(0, 121, num_transfers)
+    timestamp = base_time + pd.to_timedelta(minutes_ago, unit='m')
+    
+    # Random whale transfer amount (min_eth-5000 ETH)
+    eth_amount = rng.uniform(min_eth, 5000, num_transfers)
+    
+    # Random addresses - a non-zero offset guarantees to != from
+    from_idx = rng.integers(0, n, num_transfers)
+    to_idx = (from_idx + rng.integers(1, n, num_transfers)) % n
+    
+    # Random transaction hash - one hex encode for all rows, then slice
+    hash_hex = rng.bytes(32 * num_transfers).hex()
+    tx_hash = ['0x' + hash_hex[i:i + 64] for i in range(0, 64 * num_transfers, 64)]
+    
+    # Random gas data
+    gas_gwei = rng.uniform(10, 100, num_transfers)
+    gas_used = rng.integers(21000, 500001, num_transfers)
+    gas_fee_eth = (gas_gwei * gas_used) / 1e9
+    
+    # Random block number
+    block_number = 21000000 + rng.integers(0, 100001, num_transfers)
+    
+    df = pd.DataFrame({
+        'block_timestamp': timestamp,
+        'block_number': block_number,
+        'transaction_hash': tx_hash,
+        'from_address': WHALE_ADDRESSES[from_idx],
+        'to_address': WHALE_ADDRESSES[to_idx],
+        'eth_amount': eth_amount,
+        'gas_gwei': gas_gwei,
+        'gas_used': gas_used,
+        'gas_fee_eth': gas_fee_eth
+    })
+    
+    return df.sort_values('block_timestamp', ascending=False)
 
-def format_address(address: str) -> str:
-    """Format Ethereum address for display"""
-    return f"{address[:6]}...{address[-4:]}"
+@st.cache_data(max_entries=32)
+def compute_whale_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate sent volume per address, top 10 by total ETH"""
+    whale_stats = df.groupby('from_address').agg({
+        'eth_amount': ['sum', 'count', 'mean']
+    }).round(2)
+    whale_stats.columns = ['total_eth', 'transfer_count', 'avg_eth']
+    return whale_stats.reset_index().sort_values('total_eth', ascending=True).tail(10)
+
+@st.cache_data(max_entries=32)
+def compute_amount_histogram(amounts: np.ndarray, bins: int = 20) -> tuple:
+    """Bin ETH amounts once, returning (counts, bin_edges)"""
+    return np.histogram(amounts, bins=bins)
 
 def format_eth_amount(amount: float) -> str:
     """Format ETH amount with appropriate precision"""
@@ -89,6 +100,75 @@ def format_eth_amount(amount: float) -> str:
     else:
         return f"{amount:,.2f} ETH"
 
+def format_addresses(addresses: pd.Series) -> pd.Series:
+    """Shorten a Series of addresses to 0x1234...abcd for display"""
+    return addresses.str.slice(0, 6) + '...' + addresses.str.slice(-4)
+
+def format_eth_amounts(amounts: pd.Series) -> pd.Series:
+    """Vectorized format_eth_amount for a Series of ETH amounts"""
+    values = amounts.to_numpy()
+    tier = np.select([values >= 1000, values >= 100], [0, 1], default=2)
+
+    formatted = pd.Series('', index=amounts.index, dtype=object)
+    for i, fmt in enumerate(('{:,.0f} ETH', '{:,.1f} ETH', '{:,.2f} ETH')):
+        mask = tier == i
+        formatted[mask] = amounts[mask].map(fmt.format)
+    return formatted
+
+# Figure skeletons are built once per process; each render copies one and
+# only pushes the new data arrays into its trace
+@st.cache_resource
+def timeline_skeleton() -> go.Figure:
+    """Empty bubble chart with the timeline layout and hover template"""
+    fig = go.Figure(go.Scatter(
+        mode='markers',
+        marker=dict(sizemode='area', sizemin=2, color='#636efa'),
+        hovertemplate=(
+            "Time=%{x}<br>ETH Amount=%{y}<br>Gas Fee (ETH)=%{marker.size}<br>"
+            "from_address=%{customdata[0]}<br>to_address=%{customdata[1]}<br>"
+            "gas_gwei=%{customdata[2]:.1f}<extra></extra>"
+        )
+    ))
+    fig.update_layout(
+        title="🕐 Whale Transfers Over Time",
+        xaxis_title='Time',
+        yaxis_title='ETH Amount',
+        height=400,
+        showlegend=False,
+        hovermode='closest'
+    )
+    return fig
+
+@st.cache_resource
+def histogram_skeleton() -> go.Figure:
+    """Empty pre-binned histogram with the distribution layout"""
+    fig = go.Figure(go.Bar(marker_color='#1f77b4'))
+    fig.update_layout(
+        title="📊 Transfer Size Distribution",
+        xaxis_title='ETH Amount',
+        yaxis_title='Number of Transfers',
+        bargap=0,
+        height=300
+    )
+    return fig
+
+@st.cache_resource
+def whales_skeleton() -> go.Figure:
+    """Empty horizontal bar chart with the top-whales layout"""
+    fig = go.Figure(go.Bar(
+        orientation='h',
+        marker_color='#4292c6',
+        hovertemplate="Address=%{y}<br>Total ETH Sent=%{x}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="🐋 Top Whale Addresses",
+        xaxis_title='Total ETH Sent',
+        yaxis_title='Address',
+        height=300,
+        showlegend=False
+    )
+    return fig
+
 def main():
     # Header
     st.title("🐋 Ethereum Whale Tracker Demo")
@@ -122,14 +202,12 @@ def main():
     )
     
     if auto_refresh:
-        time.sleep(10)
-        st.rerun()
+        # Auto refresh
+        st_autorefresh(interval=10_000, key="demo_refresh")
     
     # Generate sample data
     with st.spinner("🔍 Generating sample whale activity..."):
-        df_transfers = generate_sample_whale_data(num_transfers)
-        # Filter by minimum ETH
-        df_transfers = df_transfers[df_transfers['eth_amount'] >= min_eth]
+        df_transfers = generate_sample_whale_data(num_transfers, min_eth)
     
     if df_transfers.empty:
         st.warning("⚠️ No whale transfers found with current filters.")
@@ -137,35 +215,33 @@ def main():
     
     # Main metrics
     col1, col2, col3, col4 = st.columns(4)
+    amount_stats = df_transfers['eth_amount'].agg(['count', 'sum', 'mean', 'max'])
     
     with col1:
         st.metric(
             "🐋 Whale Transfers", 
-            len(df_transfers),
+            int(amount_stats['count']),
             help="Number of large transfers found"
         )
     
     with col2:
-        total_eth = df_transfers['eth_amount'].sum()
         st.metric(
             "💰 Total ETH Moved", 
-            format_eth_amount(total_eth),
+            format_eth_amount(amount_stats['sum']),
             help="Total ETH in all whale transfers"
         )
     
     with col3:
-        avg_eth = df_transfers['eth_amount'].mean()
         st.metric(
             "📊 Average Transfer", 
-            format_eth_amount(avg_eth),
+            format_eth_amount(amount_stats['mean']),
             help="Average size of whale transfers"
         )
     
     with col4:
-        max_eth = df_transfers['eth_amount'].max()
         st.metric(
             "🚀 Largest Transfer", 
-            format_eth_amount(max_eth),
+            format_eth_amount(amount_stats['max']),
             help="Biggest whale transfer found"
         )
     
@@ -173,30 +249,16 @@ def main():
     st.header("📈 Whale Activity Analysis")
     
     # Time series chart
-    fig_timeline = px.scatter(
-        df_transfers, 
-        x='block_timestamp', 
-        y='eth_amount',
-        size='gas_fee_eth',
-        color='eth_amount',
-        hover_data={
-            'from_address': True,
-            'to_address': True,
-            'gas_gwei': ':.1f'
-        },
-        title="🕐 Whale Transfers Over Time",
-        labels={
-            'block_timestamp': 'Time',
-            'eth_amount': 'ETH Amount',
-            'gas_fee_eth': 'Gas Fee (ETH)'
-        },
-        color_continuous_scale='Viridis'
-    )
-    
-    fig_timeline.update_layout(
-        height=400,
-        showlegend=False,
-        hovermode='closest'
+    fig_timeline = go.Figure(timeline_skeleton())
+    gas_fee = df_transfers['gas_fee_eth']
+    fig_timeline.update_traces(
+        x=df_transfers['block_timestamp'],
+        y=df_transfers['eth_amount'],
+        marker=dict(
+            size=gas_fee,
+            sizeref=2.0 * gas_fee.max() / 20 ** 2
+        ),
+        customdata=df_transfers[['from_address', 'to_address', 'gas_gwei']].to_numpy()
     )
     
     st.plotly_chart(fig_timeline, use_container_width=True)
@@ -206,40 +268,28 @@ def main():
     
     with col_left:
         # ETH amount distribution
-        fig_hist = px.histogram(
-            df_transfers, 
-            x='eth_amount', 
-            nbins=20,
-            title="📊 Transfer Size Distribution",
-            labels={'eth_amount': 'ETH Amount', 'count': 'Number of Transfers'},
-            color_discrete_sequence=['#1f77b4']
+        counts, edges = compute_amount_histogram(df_transfers['eth_amount'].to_numpy())
+        fig_hist = go.Figure(histogram_skeleton())
+        fig_hist.update_traces(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges)
         )
-        fig_hist.update_layout(height=300)
         st.plotly_chart(fig_hist, use_container_width=True)
     
     with col_right:
         # Top addresses by volume
-        whale_stats = df_transfers.groupby('from_address').agg({
-            'eth_amount': ['sum', 'count', 'mean']
-        }).round(2)
-        whale_stats.columns = ['total_eth', 'transfer_count', 'avg_eth']
-        whale_stats = whale_stats.reset_index().sort_values('total_eth', ascending=True).tail(10)
+        whale_stats = compute_whale_stats(df_transfers)
         
-        fig_whales = px.bar(
-            whale_stats, 
-            x='total_eth', 
-            y='from_address',
-            orientation='h',
-            title="🐋 Top Whale Addresses",
-            labels={'total_eth': 'Total ETH Sent', 'from_address': 'Address'},
-            color='total_eth',
-            color_continuous_scale='Blues'
+        fig_whales = go.Figure(whales_skeleton())
+        fig_whales.update_traces(
+            x=whale_stats['total_eth'],
+            y=whale_stats['from_address']
         )
-        fig_whales.update_layout(height=300, showlegend=False)
-        fig_whales.update_yaxis(
+        fig_whales.update_yaxes(
             tickmode='array', 
-            tickvals=list(range(len(whale_stats))), 
-            ticktext=[format_address(addr) for addr in whale_stats['from_address']]
+            tickvals=whale_stats['from_address'], 
+            ticktext=format_addresses(whale_stats['from_address'])
         )
         st.plotly_chart(fig_whales, use_container_width=True)
     
@@ -247,15 +297,15 @@ def main():
     st.header("🔍 Recent Whale Transfers")
     
     # Format the dataframe for display
-    display_df = df_transfers.copy()
-    display_df['from_address'] = display_df['from_address'].apply(format_address)
-    display_df['to_address'] = display_df['to_address'].apply(format_address)
-    display_df['eth_amount_formatted'] = display_df['eth_amount'].apply(format_eth_amount)
+    display_df = df_transfers[['block_timestamp', 'eth_amount', 'from_address', 'to_address', 'gas_gwei', 'transaction_hash']].head(20).copy()
+    display_df['from_address'] = format_addresses(display_df['from_address'])
+    display_df['to_address'] = format_addresses(display_df['to_address'])
+    display_df['eth_amount_formatted'] = format_eth_amounts(display_df['eth_amount'])
     display_df['gas_gwei'] = display_df['gas_gwei'].round(1)
-    display_df['transaction_hash'] = display_df['transaction_hash'].apply(lambda x: format_address(x))
+    display_df['transaction_hash'] = format_addresses(display_df['transaction_hash'])
     
     st.dataframe(
-        display_df[['block_timestamp', 'eth_amount_formatted', 'from_address', 'to_address', 'gas_gwei', 'transaction_hash']].head(20),
+        display_df[['block_timestamp', 'eth_amount_formatted', 'from_address', 'to_address', 'gas_gwei', 'transaction_hash']],
         use_container_width=True,
         column_config={
             'block_timestamp': st.column_config.DatetimeColumn('Time', format='MMM DD, HH:mm:ss'),